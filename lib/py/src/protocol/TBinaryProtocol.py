@@ -20,6 +20,52 @@
 from TProtocol import *
 from struct import pack, unpack
 
+try:
+  from struct import Struct
+except ImportError:
+  # struct.Struct only exists in Python 2.5+.
+  class Struct:
+    def __init__(self, format):
+      self.format = format
+
+    def pack(self, *args):
+      return pack(self.format, *args)
+
+    def unpack(self, buff):
+      return unpack(self.format, buff)
+
+# Precompiled formats, so the hot paths don't reparse a format string on
+# every call.
+_BYTE = Struct("!b")
+_I16 = Struct("!h")
+_I32 = Struct("!i")
+_I64 = Struct("!q")
+_DOUBLE = Struct("!d")
+_I32_I32 = Struct("!ii")
+_BYTE_I32 = Struct("!bi")
+_BYTE_I16 = Struct("!bh")
+_BYTE_BYTE_I32 = Struct("!bbi")
+
+# Encodings of constant values, written without packing anything.
+_FALSE = _BYTE.pack(0)
+_TRUE = _BYTE.pack(1)
+_FIELD_STOP = _BYTE.pack(TType.STOP)
+
+# Encoded sizes of the fixed-width types, indexed by (type & 0xff) so that
+# any type byte read off the wire is a valid index.  None for the rest.
+_FIXED_WIDTH = [None] * 256
+_FIXED_WIDTH[TType.BOOL] = 1
+_FIXED_WIDTH[TType.BYTE] = 1
+_FIXED_WIDTH[TType.I16] = 2
+_FIXED_WIDTH[TType.I32] = 4
+_FIXED_WIDTH[TType.I64] = 8
+_FIXED_WIDTH[TType.DOUBLE] = 8
+_FIXED_WIDTH = tuple(_FIXED_WIDTH)
+
+# Upper bound on a single read when skipping fixed-width data, so that a
+# bogus container size off the wire can't force one huge allocation.
+_SKIP_CHUNK = 65536
+
 class TBinaryProtocol(TProtocolBase):
 
   """Binary implementation of the Thrift protocol driver."""
@@ -41,15 +87,26 @@ class TBinaryProtocol(TProtocolBase):
     self.strictRead = strictRead
     self.strictWrite = strictWrite
 
+  def __setattr__(self, name, value):
+    # Every primitive goes through the transport's write/readAll, so bind
+    # them once whenever self.trans is (re)assigned.
+    self.__dict__[name] = value
+    if name == 'trans':
+      self.__dict__['_write'] = value.write
+      self.__dict__['_readAll'] = value.readAll
+
   def writeMessageBegin(self, name, type, seqid):
+    # Pack the fixed-width parts together, but write the name on its own:
+    # concatenating a unicode name with the packed header would try to
+    # decode the header bytes as ASCII.
     if self.strictWrite:
-      self.writeI32(TBinaryProtocol.VERSION_1 | type)
-      self.writeString(name)
-      self.writeI32(seqid)
+      self._write(_I32_I32.pack(TBinaryProtocol.VERSION_1 | type, len(name)))
+      self._write(name)
+      self._write(_I32.pack(seqid))
     else:
-      self.writeString(name)
-      self.writeByte(type)
-      self.writeI32(seqid)
+      self._write(_I32.pack(len(name)))
+      self._write(name)
+      self._write(_BYTE_I32.pack(type, seqid))
 
   def writeMessageEnd(self):
     pass
@@ -61,69 +118,69 @@ class TBinaryProtocol(TProtocolBase):
     pass
 
   def writeFieldBegin(self, name, type, id):
-    self.writeByte(type)
-    self.writeI16(id)
+    buff = _BYTE_I16.pack(type, id)
+    self._write(buff)
 
   def writeFieldEnd(self):
     pass
 
   def writeFieldStop(self):
-    self.writeByte(TType.STOP);
+    self._write(_FIELD_STOP)
 
   def writeMapBegin(self, ktype, vtype, size):
-    self.writeByte(ktype)
-    self.writeByte(vtype)
-    self.writeI32(size)
+    buff = _BYTE_BYTE_I32.pack(ktype, vtype, size)
+    self._write(buff)
 
   def writeMapEnd(self):
     pass
 
   def writeListBegin(self, etype, size):
-    self.writeByte(etype)
-    self.writeI32(size)
+    buff = _BYTE_I32.pack(etype, size)
+    self._write(buff)
 
   def writeListEnd(self):
     pass
 
   def writeSetBegin(self, etype, size):
-    self.writeByte(etype)
-    self.writeI32(size)
+    buff = _BYTE_I32.pack(etype, size)
+    self._write(buff)
 
   def writeSetEnd(self):
     pass
 
   def writeBool(self, bool):
     if bool:
-      self.writeByte(1)
+      self._write(_TRUE)
     else:
-      self.writeByte(0)
+      self._write(_FALSE)
 
   def writeByte(self, byte):
-    buff = pack("!b", byte)
-    self.trans.write(buff)
+    buff = _BYTE.pack(byte)
+    self._write(buff)
 
   def writeI16(self, i16):
-    buff = pack("!h", i16)
-    self.trans.write(buff)
+    buff = _I16.pack(i16)
+    self._write(buff)
 
   def writeI32(self, i32):
-    buff = pack("!i", i32)
-    self.trans.write(buff)
+    buff = _I32.pack(i32)
+    self._write(buff)
 
   def writeI64(self, i64):
-    buff = pack("!q", i64)
-    self.trans.write(buff)
+    buff = _I64.pack(i64)
+    self._write(buff)
 
   def writeDouble(self, dub):
-    buff = pack("!d", dub)
-    self.trans.write(buff)
+    buff = _DOUBLE.pack(dub)
+    self._write(buff)
 
   def writeString(self, str):
-    self.writeI32(len(str))
-    self.trans.write(str)
+    buff = _I32.pack(len(str))
+    self._write(buff)
+    self._write(str)
 
   def readMessageBegin(self):
-    sz = self.readI32()
+    sz, = _I32.unpack(self._readAll(4))
     if sz < 0:
       version = sz & TBinaryProtocol.VERSION_MASK
       if version != TBinaryProtocol.VERSION_1:
@@ -134,9 +191,8 @@ class TBinaryProtocol(TProtocolBase):
     else:
       if self.strictRead:
         raise TProtocolException(type=TProtocolException.BAD_VERSION, message='No protocol version header')
-      name = self.trans.readAll(sz)
-      type = self.readByte()
-      seqid = self.readI32()
+      name = self._readAll(sz)
+      type, seqid = _BYTE_I32.unpack(self._readAll(5))
     return (name, type, seqid)
 
   def readMessageEnd(self):
@@ -149,76 +205,112 @@ class TBinaryProtocol(TProtocolBase):
     pass
 
   def readFieldBegin(self):
-    type = self.readByte()
+    type, = _BYTE.unpack(self._readAll(1))
     if type == TType.STOP:
       return (None, type, 0)
-    id = self.readI16()
+    id, = _I16.unpack(self._readAll(2))
     return (None, type, id)
 
   def readFieldEnd(self):
     pass
 
   def readMapBegin(self):
-    ktype = self.readByte()
-    vtype = self.readByte()
-    size = self.readI32()
+    buff = self._readAll(6)
+    (ktype, vtype, size) = _BYTE_BYTE_I32.unpack(buff)
     return (ktype, vtype, size)
 
   def readMapEnd(self):
     pass
 
   def readListBegin(self):
-    etype = self.readByte()
-    size = self.readI32()
+    buff = self._readAll(5)
+    (etype, size) = _BYTE_I32.unpack(buff)
     return (etype, size)
 
   def readListEnd(self):
     pass
 
   def readSetBegin(self):
-    etype = self.readByte()
-    size = self.readI32()
+    buff = self._readAll(5)
+    (etype, size) = _BYTE_I32.unpack(buff)
     return (etype, size)
 
   def readSetEnd(self):
     pass
 
   def readBool(self):
-    byte = self.readByte()
-    if byte == 0:
-      return False
-    return True
+    buff = self._readAll(1)
+    return buff != _FALSE
 
   def readByte(self):
-    buff = self.trans.readAll(1)
-    val, = unpack('!b', buff)
+    buff = self._readAll(1)
+    val, = _BYTE.unpack(buff)
     return val
 
   def readI16(self):
-    buff = self.trans.readAll(2)
-    val, = unpack('!h', buff)
+    buff = self._readAll(2)
+    val, = _I16.unpack(buff)
     return val
 
   def readI32(self):
-    buff = self.trans.readAll(4)
-    val, = unpack('!i', buff)
+    buff = self._readAll(4)
+    val, = _I32.unpack(buff)
     return val
 
   def readI64(self):
-    buff = self.trans.readAll(8)
-    val, = unpack('!q', buff)
+    buff = self._readAll(8)
+    val, = _I64.unpack(buff)
     return val
 
   def readDouble(self):
-    buff = self.trans.readAll(8)
-    val, = unpack('!d', buff)
+    buff = self._readAll(8)
+    val, = _DOUBLE.unpack(buff)
     return val
 
   def readString(self):
-    len = self.readI32()
-    str = self.trans.readAll(len)
+    len, = _I32.unpack(self._readAll(4))
+    str = self._readAll(len)
     return str
 
+  def skip(self, type):
+    # Containers of fixed-width elements are skipped with bulk reads
+    # instead of one read per element.
+    if type == TType.MAP:
+      (ktype, vtype, size) = self.readMapBegin()
+      kwidth = _FIXED_WIDTH[ktype & 0xff]
+      vwidth = _FIXED_WIDTH[vtype & 0xff]
+      if kwidth is None or vwidth is None:
+        for i in range(size):
+          self.skip(ktype)
+          self.skip(vtype)
+      else:
+        self.__skipBytes(size * (kwidth + vwidth))
+      self.readMapEnd()
+    elif type == TType.SET:
+      (etype, size) = self.readSetBegin()
+      self.__skipElements(etype, size)
+      self.readSetEnd()
+    elif type == TType.LIST:
+      (etype, size) = self.readListBegin()
+      self.__skipElements(etype, size)
+      self.readListEnd()
+    else:
+      TProtocolBase.skip(self, type)
+
+  def __skipElements(self, etype, size):
+    width = _FIXED_WIDTH[etype & 0xff]
+    if width is None:
+      for i in range(size):
+        self.skip(etype)
+    else:
+      self.__skipBytes(size * width)
+
+  def __skipBytes(self, sz):
+    while sz > 0:
+      chunk = min(sz, _SKIP_CHUNK)
+      self._readAll(chunk)
+      sz -= chunk
+
 
 class TBinaryProtocolFactory:
   def __init__(self, strictRead=False, strictWrite=True):
@@ -33,6 +33,22 @@ class TProtocolException(TException):
     TException.__init__(self, message)
     self.type = type
 
+# Names of the methods reading each scalar type, indexed by TType.
+_SCALAR_READERS = (
+  None,           # STOP
+  None,           # VOID
+  'readBool',     # BOOL
+  'readByte',     # BYTE
+  'readDouble',   # DOUBLE
+  None,
+  'readI16',      # I16
+  None,
+  'readI32',      # I32
+  None,
+  'readI64',      # I64
+  'readString',   # STRING
+)
+
 class TProtocolBase:
 
   """Base class for Thrift protocol driver."""
@@ -158,22 +174,10 @@ class TProtocolBase:
     pass
 
   def skip(self, type):
-    if type == TType.STOP:
-      return
-    elif type == TType.BOOL:
-      self.readBool()
-    elif type == TType.BYTE:
-      self.readByte()
-    elif type == TType.I16:
-      self.readI16()
-    elif type == TType.I32:
-      self.readI32()
-    elif type == TType.I64:
-      self.readI64()
-    elif type == TType.DOUBLE:
-      self.readDouble()
-    elif type == TType.STRING:
-      self.readString()
+    if 0 <= type < len(_SCALAR_READERS):
+      reader = _SCALAR_READERS[type]
+      if reader is not None:
+        getattr(self, reader)()
     elif type == TType.STRUCT:
       name = self.readStructBegin()
       while True:
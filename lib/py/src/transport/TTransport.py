@@ -52,17 +52,20 @@ class TTransportBase:
     pass
 
   def readAll(self, sz):
-    buff = ''
+    # Collect the chunks and join them once at the end.  Appending to a
+    # string copies everything read so far on each short read, which is
+    # quadratic for large strings and binary fields.
+    chunks = []
     have = 0
     while (have < sz):
       chunk = self.read(sz-have)
       have += len(chunk)
-      buff += chunk
+      chunks.append(chunk)
 
       if len(chunk) == 0:
         raise EOFError()
 
-    return buff
+    return ''.join(chunks)
 
   def write(self, buf):
     pass
@@ -155,6 +158,17 @@ class TBufferedTransport(TTransportBase,CReadableTransport):
     self.__rbuf = StringIO(self.__trans.read(max(sz, self.DEFAULT_BUFFER)))
     return self.__rbuf.read(sz)
 
+  def readAll(self, sz):
+    # Serve the request straight from the buffer when it holds enough,
+    # skipping the generic read loop.  StringIO.read() treats a negative
+    # size as "read everything", so leave those to the generic loop.
+    if sz <= 0:
+      return TTransportBase.readAll(self, sz)
+    ret = self.__rbuf.read(sz)
+    if len(ret) == sz:
+      return ret
+    return ret + TTransportBase.readAll(self, sz - len(ret))
+
   def write(self, buf):
     self.__wbuf.write(buf)
 
@@ -214,6 +228,14 @@ class TMemoryBuffer(TTransportBase, CReadableTransport):
   def read(self, sz):
     return self._buffer.read(sz)
 
+  def readAll(self, sz):
+    if sz <= 0:
+      return TTransportBase.readAll(self, sz)
+    ret = self._buffer.read(sz)
+    if len(ret) == sz:
+      return ret
+    return ret + TTransportBase.readAll(self, sz - len(ret))
+
   def write(self, buf):
     self._buffer.write(buf)
 
@@ -267,6 +289,14 @@ class TFramedTransport(TTransportBase, CReadableTransport):
     self.readFrame()
     return self.__rbuf.read(sz)
 
+  def readAll(self, sz):
+    if sz <= 0:
+      return TTransportBase.readAll(self, sz)
+    ret = self.__rbuf.read(sz)
+    if len(ret) == sz:
+      return ret
+    return ret + TTransportBase.readAll(self, sz - len(ret))
+
   def readFrame(self):
     buff = self.__trans.readAll(4)
     sz, = unpack('!i', buff)
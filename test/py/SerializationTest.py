@@ -24,6 +24,7 @@ sys.path.insert(0, './gen-py')
 sys.path.insert(0, glob.glob('../../lib/py/build/lib.*')[0])
 
 from ThriftTest.ttypes import *
+from thrift.Thrift import TMessageType
 from thrift.transport import TTransport
 from thrift.transport import TSocket
 from thrift.protocol import TBinaryProtocol
@@ -119,6 +120,36 @@ class AcceleratedFramedTest(unittest.TestCase):
     self.assertEqual(prot.readI16(), 24)
 
 
+class MessageHeaderTest(unittest.TestCase):
+  def testUnicodeName(self):
+    """Test that TBinaryProtocol accepts unicode method names"""
+    for strictWrite in (True, False):
+      databuf = TTransport.TMemoryBuffer()
+      prot = TBinaryProtocol.TBinaryProtocol(databuf, strictWrite=strictWrite)
+      prot.writeMessageBegin(u'ping', TMessageType.CALL, 7)
+      prot.writeMessageEnd()
+
+      prot = TBinaryProtocol.TBinaryProtocol(
+          TTransport.TMemoryBuffer(databuf.getvalue()))
+      self.assertEqual(prot.readMessageBegin(), ('ping', TMessageType.CALL, 7))
+
+class ProtocolTransportTest(unittest.TestCase):
+  def testReassignTransport(self):
+    """Test that TBinaryProtocol follows a reassigned trans attribute"""
+    first = TTransport.TMemoryBuffer()
+    second = TTransport.TMemoryBuffer()
+    prot = TBinaryProtocol.TBinaryProtocol(first)
+    prot.writeI32(1)
+    prot.trans = second
+    prot.writeI32(2)
+    self.assertEqual(TBinaryProtocol.TBinaryProtocol(
+        TTransport.TMemoryBuffer(first.getvalue())).readI32(), 1)
+    self.assertEqual(TBinaryProtocol.TBinaryProtocol(
+        TTransport.TMemoryBuffer(second.getvalue())).readI32(), 2)
+
+    prot.trans = TTransport.TMemoryBuffer(second.getvalue())
+    self.assertEqual(prot.readI32(), 2)
+
 
 def suite():
   suite = unittest.TestSuite()
@@ -127,6 +158,8 @@ def suite():
   suite.addTest(loader.loadTestsFromTestCase(NormalBinaryTest))
   suite.addTest(loader.loadTestsFromTestCase(AcceleratedBinaryTest))
   suite.addTest(loader.loadTestsFromTestCase(AcceleratedFramedTest))
+  suite.addTest(loader.loadTestsFromTestCase(MessageHeaderTest))
+  suite.addTest(loader.loadTestsFromTestCase(ProtocolTransportTest))
   return suite
 
 if __name__ == "__main__":
@@ -63,6 +63,54 @@ class TestEof(unittest.TestCase):
 
     self.fail("Should have gotten EOFError")
 
+  def readAllTestHelper(self, trans, data):
+    """Test readAll on trans, which must yield data (at least 10000 bytes)"""
+    self.assertEqual(trans.readAll(0), '')
+    self.assertEqual(trans.readAll(-1), '')
+    self.assertEqual(trans.readAll(-5), '')
+    self.assertEqual(trans.readAll(3), data[0:3])
+    self.assertEqual(trans.readAll(-1), '')
+    # Crosses the buffered transport's 4096 byte buffer and the frames.
+    self.assertEqual(trans.readAll(5000), data[3:5003])
+    self.assertEqual(trans.readAll(4000), data[5003:9003])
+    self.assertEqual(trans.readAll(len(data) - 9003), data[9003:])
+    self.assertEqual(trans.readAll(0), '')
+    try:
+      trans.readAll(1)
+    except EOFError:
+      return
+    self.fail("Should have gotten EOFError")
+
+  def testTransportReadAllSizes(self):
+    """Test readAll with zero and negative sizes and across buffer boundaries"""
+    data = ''.join([chr(i % 256) for i in xrange(10000)])
+    self.readAllTestHelper(TTransport.TMemoryBuffer(data), data)
+    self.readAllTestHelper(
+        TTransport.TBufferedTransport(TTransport.TMemoryBuffer(data)), data)
+
+    framed = TTransport.TMemoryBuffer()
+    writer = TTransport.TFramedTransport(framed)
+    for start in xrange(0, len(data), 3000):
+      writer.write(data[start:start + 3000])
+      writer.flush()
+    self.readAllTestHelper(
+        TTransport.TFramedTransport(TTransport.TMemoryBuffer(framed.getvalue())),
+        data)
+
+  def testBinaryProtocolNegativeStringSize(self):
+    """Test that a negative string length reads an empty string"""
+    trans = TTransport.TMemoryBuffer()
+    prot = TBinaryProtocol.TBinaryProtocol(trans)
+    prot.writeI32(-1)
+    prot.writeI32(42)
+    data = trans.getvalue()
+
+    for trans in (TTransport.TMemoryBuffer(data),
+                  TTransport.TBufferedTransport(TTransport.TMemoryBuffer(data))):
+      prot = TBinaryProtocol.TBinaryProtocol(trans)
+      self.assertEqual(prot.readString(), '')
+      self.assertEqual(prot.readI32(), 42)
+
   def eofTestHelper(self, pfactory):
     trans = TTransport.TMemoryBuffer(self.data)
     prot = pfactory.getProtocol(trans)
@@ -111,6 +159,93 @@ class TestEof(unittest.TestCase):
     self.eofTestHelper(TBinaryProtocol.TBinaryProtocolAcceleratedFactory())
     self.eofTestHelperStress(TBinaryProtocol.TBinaryProtocolAcceleratedFactory())
 
+  def skipTestHelper(self, write_container, ttype):
+    """Write a container followed by a marker, skip the container and check
+    that the marker is read next"""
+    trans = TTransport.TMemoryBuffer()
+    prot = TBinaryProtocol.TBinaryProtocol(trans)
+    write_container(prot)
+    prot.writeI32(0x5eed)
+
+    prot = TBinaryProtocol.TBinaryProtocol(
+        TTransport.TMemoryBuffer(trans.getvalue()))
+    prot.skip(ttype)
+    self.assertEqual(prot.readI32(), 0x5eed)
+
+  def testBinaryProtocolSkip(self):
+    """Test that TBinaryProtocol skips lists, sets and maps of fixed-width and
+    variable-width elements, including negative sizes"""
+    def writeList(etype, size, elems, writer):
+      def write(prot):
+        prot.writeListBegin(etype, size)
+        for e in elems:
+          getattr(prot, writer)(e)
+        prot.writeListEnd()
+      return write
+
+    def writeSet(etype, size, elems, writer):
+      def write(prot):
+        prot.writeSetBegin(etype, size)
+        for e in elems:
+          getattr(prot, writer)(e)
+        prot.writeSetEnd()
+      return write
+
+    def writeMap(ktype, vtype, size, items, kwriter, vwriter):
+      def write(prot):
+        prot.writeMapBegin(ktype, vtype, size)
+        for k, v in items:
+          getattr(prot, kwriter)(k)
+          getattr(prot, vwriter)(v)
+        prot.writeMapEnd()
+      return write
+
+    # Fixed-width elements.
+    self.skipTestHelper(writeList(TType.I32, 3, [1, 2, 3], 'writeI32'), TType.LIST)
+    self.skipTestHelper(writeList(TType.BOOL, 2, [True, False], 'writeBool'), TType.LIST)
+    self.skipTestHelper(writeSet(TType.DOUBLE, 2, [1.5, 2.5], 'writeDouble'), TType.SET)
+    self.skipTestHelper(writeSet(TType.I16, 0, [], 'writeI16'), TType.SET)
+    self.skipTestHelper(writeMap(TType.I64, TType.DOUBLE, 2, [(1, 1.0), (2, 2.0)],
+                                 'writeI64', 'writeDouble'), TType.MAP)
+    self.skipTestHelper(writeMap(TType.BYTE, TType.I16, 1, [(1, 2)],
+                                 'writeByte', 'writeI16'), TType.MAP)
+
+    # Variable-width elements.
+    self.skipTestHelper(writeList(TType.STRING, 2, ['a', 'bcd'], 'writeString'), TType.LIST)
+    self.skipTestHelper(writeSet(TType.STRING, 1, ['xyz'], 'writeString'), TType.SET)
+    self.skipTestHelper(writeMap(TType.I32, TType.STRING, 2, [(1, 'a'), (2, 'bc')],
+                                 'writeI32', 'writeString'), TType.MAP)
+    self.skipTestHelper(writeMap(TType.STRING, TType.I64, 1, [('k', 7)],
+                                 'writeString', 'writeI64'), TType.MAP)
+
+    # Negative sizes consume nothing past the header.
+    self.skipTestHelper(writeList(TType.I32, -1, [], 'writeI32'), TType.LIST)
+    self.skipTestHelper(writeList(TType.STRING, -5, [], 'writeString'), TType.LIST)
+    self.skipTestHelper(writeSet(TType.DOUBLE, -2, [], 'writeDouble'), TType.SET)
+    self.skipTestHelper(writeMap(TType.I64, TType.DOUBLE, -3, [],
+                                 'writeI64', 'writeDouble'), TType.MAP)
+    self.skipTestHelper(writeMap(TType.I32, TType.STRING, -3, [],
+                                 'writeI32', 'writeString'), TType.MAP)
+
+  def testBinaryProtocolSkipEof(self):
+    """Test that skipping a container whose size exceeds the data left throws
+    an EOFError"""
+    trans = TTransport.TMemoryBuffer()
+    prot = TBinaryProtocol.TBinaryProtocol(trans)
+    prot.writeMapBegin(TType.I64, TType.DOUBLE, 0x7fffffff)
+    prot.writeI64(1)
+    prot.writeDouble(1.0)
+    data = trans.getvalue()
+
+    for trans in (TTransport.TMemoryBuffer(data),
+                  TTransport.TBufferedTransport(TTransport.TMemoryBuffer(data))):
+      prot = TBinaryProtocol.TBinaryProtocol(trans)
+      try:
+        prot.skip(TType.MAP)
+      except EOFError:
+        continue
+      self.fail("Should have gotten EOFError")
+
 def suite():
   suite = unittest.TestSuite()
   loader = unittest.TestLoader()